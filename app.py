@@ -12,7 +12,7 @@ import zipfile
 import tempfile
 import shutil
 from pathlib import Path
-from PIL import Image as PILImage
+from renditions import decode_image, save_renditions, rendition_files
 import os
 import sys
 
@@ -27,6 +27,8 @@ class GeminiImageGenerator:
         self.api_key = tk.StringVar()
         self.style = tk.StringVar()
         self.resolution = tk.StringVar(value="1K")
+        self.make_proxy = tk.BooleanVar(value=True)
+        self.make_thumb = tk.BooleanVar(value=True)
         self.is_generating = False
         self.temp_dir = None
         
@@ -92,6 +94,13 @@ class GeminiImageGenerator:
         res_combo.current(0)
         res_combo.pack(side=tk.LEFT)
         
+        # Renditions
+        rendition_frame = tk.Frame(self.root, pady=5)
+        rendition_frame.pack(fill=tk.X, padx=20)
+        tk.Label(rendition_frame, text="추가 출력:", width=10, anchor="w").pack(side=tk.LEFT)
+        tk.Checkbutton(rendition_frame, text="720p 프록시", variable=self.make_proxy).pack(side=tk.LEFT)
+        tk.Checkbutton(rendition_frame, text="썸네일", variable=self.make_thumb).pack(side=tk.LEFT)
+        
         # Generate button
         self.generate_btn = tk.Button(
             self.root,
@@ -209,6 +218,12 @@ class GeminiImageGenerator:
             success_count = 0
             failed = []
             
+            renditions = ["full"]
+            if self.make_proxy.get():
+                renditions.append("proxy")
+            if self.make_thumb.get():
+                renditions.append("thumb")
+            
             for idx, prompt in enumerate(prompts, 1):
                 # Update UI
                 self.progress_label.config(text=f"생성 중: {idx}/{total}")
@@ -245,43 +260,11 @@ class GeminiImageGenerator:
                     image_saved = False
                     for part in response.parts:
                         if part.inline_data is not None:
-                            from io import BytesIO
-                            import base64
-                            
-                            image_data = part.inline_data.data
-                            if isinstance(image_data, str):
-                                image_data = base64.b64decode(image_data)
-                            
-                            image = PILImage.open(BytesIO(image_data))
-                            
-                            # Convert to RGB
-                            if image.mode == 'RGBA':
-                                rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
-                                rgb_image.paste(image, mask=image.split()[3])
-                                image = rgb_image
-                            elif image.mode != 'RGB':
-                                image = image.convert('RGB')
-                            
-                            # Force 16:9 aspect ratio
-                            width, height = image.size
-                            target_aspect = 16 / 9
-                            current_aspect = width / height
-                            
-                            if abs(current_aspect - target_aspect) > 0.01:
-                                # Crop to 16:9
-                                if current_aspect > target_aspect:
-                                    # Too wide, crop width
-                                    new_width = int(height * target_aspect)
-                                    left = (width - new_width) // 2
-                                    image = image.crop((left, 0, left + new_width, height))
-                                else:
-                                    # Too tall, crop height
-                                    new_height = int(width / target_aspect)
-                                    top = (height - new_height) // 2
-                                    image = image.crop((0, top, width, top + new_height))
+                            # Decode, convert to RGB and crop to 16:9
+                            image = decode_image(part.inline_data.data)
                             
-                            # Save as PNG
-                            image.save(f"{self.temp_dir}/{idx:03d}.png", 'PNG')
+                            # Save full size PNG + proxy/thumbnail
+                            save_renditions(image, self.temp_dir, idx, renditions)
                             
                             image_saved = True
                             success_count += 1
@@ -340,8 +323,8 @@ class GeminiImageGenerator:
         try:
             # Create ZIP
             with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                for img_file in sorted(Path(self.temp_dir).glob("*.png")):
-                    zip_file.write(img_file, img_file.name)
+                for img_file, arcname in rendition_files(self.temp_dir):
+                    zip_file.write(img_file, arcname)
             
             self.log(f"\n💾 ZIP 저장 완료: {file_path}")
             messagebox.showinfo("완료", f"ZIP 파일 저장 완료:\n{file_path}")
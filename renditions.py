@@ -0,0 +1,209 @@
+"""
+응답 이미지를 한 번 디코딩해 16:9 로 크롭하고, 그 한 장으로 여러 출력본(렌디션)을
+동시에 저장
+
+출력 구조 (ZIP 안에서도 동일):
+    001.png         원본 해상도 마스터
+    proxy/001.jpg   720p 편집용 프록시
+    thumb/001.jpg   콘택트 시트용 썸네일
+
+크기·형식·품질은 load_renditions 로 JSON 설정 파일을 읽어 바꾸거나 추가할 수 있음
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from PIL import Image as PILImage
+
+# size 가 None 이면 원본 크기, 원본보다 큰 크기로는 확대하지 않음
+RENDITIONS = {
+    "full": {
+        "folder": "",
+        "size": None,
+        "format": "PNG",
+        "ext": "png",
+        "options": {"compress_level": 6}
+    },
+    "proxy": {
+        "folder": "proxy",
+        "size": (1280, 720),
+        "format": "JPEG",
+        "ext": "jpg",
+        "options": {"quality": 85, "optimize": True}
+    },
+    "thumb": {
+        "folder": "thumb",
+        "size": (320, 180),
+        "format": "JPEG",
+        "ext": "jpg",
+        "options": {"quality": 80}
+    }
+}
+
+DEFAULT_RENDITIONS = ["full", "proxy", "thumb"]
+
+FORMAT_EXTENSIONS = {"PNG": "png", "JPEG": "jpg", "WEBP": "webp"}
+
+# 흔히 쓰는 확장자 표기를 Pillow 형식 이름으로
+FORMAT_ALIASES = {"JPG": "JPEG", "TIF": "TIFF"}
+
+# 기본 렌디션 수만큼만 스레드를 쓰므로 프로세스 전체에서 하나를 공유
+_executor = ThreadPoolExecutor(max_workers=len(RENDITIONS))
+
+
+def load_renditions(path):
+    """JSON 설정 파일로 기본 렌디션을 바꾸거나 추가한 사본 반환
+
+    예: {"proxy": {"size": [1920, 1080], "format": "WEBP", "quality": 80},
+         "preview": {"size": [640, 360], "quality": 70}}
+    """
+    config = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(config, dict):
+        raise ValueError("설정 파일은 {이름: 설정} 형태의 JSON 객체여야 합니다")
+
+    PILImage.init()
+    specs = {name: dict(spec, options=dict(spec["options"])) for name, spec in RENDITIONS.items()}
+
+    for name, entry in config.items():
+        # 새 렌디션은 이름이 곧 폴더 이름이므로 출력 폴더 밖을 가리키지 못하게 함
+        if not re.fullmatch(r"[\w.-]+", name) or name.startswith("."):
+            raise ValueError(f"렌디션 이름에 사용할 수 없는 문자가 있습니다: {name}")
+        if not isinstance(entry, dict):
+            raise ValueError(f"{name}: 설정은 JSON 객체여야 합니다")
+
+        unknown = set(entry) - {"size", "format", "quality", "options"}
+        if unknown:
+            raise ValueError(f"{name}: 알 수 없는 설정 {', '.join(sorted(unknown))}")
+
+        spec = specs.setdefault(name, {
+            "folder": name,
+            "size": None,
+            "format": "JPEG",
+            "ext": "jpg",
+            "options": {}
+        })
+        if "size" in entry:
+            size = entry["size"]
+            if size is not None and not (
+                isinstance(size, list) and len(size) == 2
+                and all(isinstance(v, int) and not isinstance(v, bool) and v > 0 for v in size)
+            ):
+                raise ValueError(f"{name}: size 는 null 또는 [너비, 높이] 양의 정수여야 합니다")
+            spec["size"] = tuple(size) if size else None
+        if "format" in entry:
+            image_format = str(entry["format"]).upper()
+            image_format = FORMAT_ALIASES.get(image_format, image_format)
+            if image_format not in PILImage.SAVE:
+                raise ValueError(f"{name}: 저장할 수 없는 형식입니다: {entry['format']}")
+            spec["format"] = image_format
+            spec["ext"] = FORMAT_EXTENSIONS.get(spec["format"], spec["format"].lower())
+            # 다른 형식의 저장 옵션은 그대로 쓸 수 없으므로 비움
+            spec["options"] = {}
+        if "quality" in entry:
+            if not isinstance(entry["quality"], int) or isinstance(entry["quality"], bool):
+                raise ValueError(f"{name}: quality 는 정수여야 합니다")
+            spec["options"]["quality"] = entry["quality"]
+        if not isinstance(entry.get("options", {}), dict):
+            raise ValueError(f"{name}: options 는 JSON 객체여야 합니다")
+        spec["options"].update(entry.get("options", {}))
+
+    # 마스터는 기존 {idx:03d}.png 이름을 유지해야 함
+    if specs["full"]["format"] != "PNG" or specs["full"]["size"] is not None:
+        raise ValueError("full 은 원본 크기 PNG 만 지원합니다")
+    return specs
+
+
+def decode_image(image_data):
+    """API 응답 이미지 데이터를 RGB 로 변환하고 16:9 로 크롭"""
+    if isinstance(image_data, str):
+        image_data = base64.b64decode(image_data)
+
+    image = PILImage.open(BytesIO(image_data))
+
+    # Convert to RGB
+    if image.mode == 'RGBA':
+        rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[3])
+        image = rgb_image
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    # Force 16:9 aspect ratio
+    width, height = image.size
+    target_aspect = 16 / 9
+    current_aspect = width / height
+
+    if abs(current_aspect - target_aspect) > 0.01:
+        # Crop to 16:9
+        if current_aspect > target_aspect:
+            # Too wide, crop width
+            new_width = int(height * target_aspect)
+            left = (width - new_width) // 2
+            image = image.crop((left, 0, left + new_width, height))
+        else:
+            # Too tall, crop height
+            new_height = int(width / target_aspect)
+            top = (height - new_height) // 2
+            image = image.crop((0, top, width, top + new_height))
+
+    return image
+
+
+def rendition_path(out_dir, idx, name, specs=None):
+    spec = (specs or RENDITIONS)[name]
+    return Path(out_dir) / spec["folder"] / f"{idx:03d}.{spec['ext']}"
+
+
+def _save_one(image, out_dir, idx, name, specs):
+    spec = specs[name]
+
+    if spec["size"] is not None:
+        max_width, max_height = spec["size"]
+        scale = min(max_width / image.width, max_height / image.height)
+        if scale < 1:
+            new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+            image = image.resize(new_size, PILImage.LANCZOS, reducing_gap=3.0)
+
+    path = rendition_path(out_dir, idx, name, specs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 임시 파일에 쓴 뒤 교체해 미리보기/ZIP 이 반쯤 쓰인 파일을 읽지 않게 함
+    tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    image.save(tmp_path, spec["format"], **spec["options"])
+    os.replace(tmp_path, path)
+    return path
+
+
+def save_renditions(image, out_dir, idx, names=None, specs=None):
+    """RGB 로 변환·크롭된 이미지를 렌디션별로 저장하고 {이름: 경로} 반환"""
+    specs = specs or RENDITIONS
+    names = names or DEFAULT_RENDITIONS
+    if "full" not in names:
+        names = ["full"] + list(names)
+
+    # Image.save 는 저장 중 객체 상태(encoderinfo)를 바꾸므로 스레드마다 사본을 넘기고,
+    # 원본은 호출한 스레드에서 full 로 저장
+    image.load()
+    futures = {
+        name: _executor.submit(_save_one, image.copy(), out_dir, idx, name, specs)
+        for name in names if name != "full"
+    }
+    paths = {"full": _save_one(image, out_dir, idx, "full", specs)}
+    paths.update({name: future.result() for name, future in futures.items()})
+    return paths
+
+
+def rendition_files(out_dir, specs=None):
+    """ZIP 에 넣을 (파일 경로, ZIP 내부 경로) 목록"""
+    out_dir = Path(out_dir)
+    files = []
+    for spec in (specs or RENDITIONS).values():
+        folder = out_dir / spec["folder"]
+        for path in sorted(folder.glob(f"[0-9]*.{spec['ext']}")):
+            files.append((path, path.relative_to(out_dir).as_posix()))
+    return files
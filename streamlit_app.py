@@ -5,7 +5,7 @@ import io
 from pathlib import Path
 import tempfile
 import shutil
-from PIL import Image as PILImage
+from renditions import decode_image, save_renditions
 
 # Page config
 st.set_page_config(
@@ -73,6 +73,20 @@ with col1:
     }
     api_resolution = resolution_map[resolution]
 
+    # Extra renditions
+    rendition_labels = {
+        "720p 프록시 (편집용)": "proxy",
+        "썸네일 (콘택트 시트용)": "thumb"
+    }
+    selected_renditions = st.multiselect(
+        "추가 출력",
+        options=list(rendition_labels),
+        default=list(rendition_labels),
+        help="원본 PNG와 함께 proxy/, thumb/ 폴더에 JPG로 저장됩니다",
+        disabled=st.session_state.generating
+    )
+    renditions = ["full"] + [rendition_labels[label] for label in selected_renditions]
+
     # Control buttons
     button_col1, button_col2 = st.columns(2)
     
@@ -108,7 +122,8 @@ with col2:
         if st.session_state.generated_images:
             # Show latest images first
             for img_info in reversed(st.session_state.generated_images[-5:]):
-                st.image(img_info['path'], caption=f"{img_info['idx']:03d}. {img_info['prompt'][:50]}...", use_container_width=True)
+                preview_path = img_info['renditions'].get('proxy', img_info['path'])
+                st.image(str(preview_path), caption=f"{img_info['idx']:03d}. {img_info['prompt'][:50]}...", use_container_width=True)
             
             if len(st.session_state.generated_images) > 5:
                 st.info(f"📝 총 {len(st.session_state.generated_images)}개 생성됨 (최근 5개만 표시)")
@@ -177,52 +192,18 @@ if st.session_state.generating:
             image_saved = False
             for part in response.parts:
                 if part.inline_data is not None:
-                    from io import BytesIO
-                    import base64
-                    
-                    # Get image data
-                    image_data = part.inline_data.data
-                    if isinstance(image_data, str):
-                        image_data = base64.b64decode(image_data)
-                    
-                    # Load and convert to 16:9
-                    image = PILImage.open(BytesIO(image_data))
-                    
-                    # Convert to RGB if needed
-                    if image.mode == 'RGBA':
-                        rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
-                        rgb_image.paste(image, mask=image.split()[3])
-                        image = rgb_image
-                    elif image.mode != 'RGB':
-                        image = image.convert('RGB')
-                    
-                    # Force 16:9 aspect ratio
-                    width, height = image.size
-                    target_aspect = 16 / 9
-                    current_aspect = width / height
-                    
-                    if abs(current_aspect - target_aspect) > 0.01:
-                        # Crop to 16:9
-                        if current_aspect > target_aspect:
-                            # Too wide, crop width
-                            new_width = int(height * target_aspect)
-                            left = (width - new_width) // 2
-                            image = image.crop((left, 0, left + new_width, height))
-                        else:
-                            # Too tall, crop height
-                            new_height = int(width / target_aspect)
-                            top = (height - new_height) // 2
-                            image = image.crop((0, top, width, top + new_height))
+                    # Decode, convert to RGB and crop to 16:9
+                    image = decode_image(part.inline_data.data)
                     
-                    # Save as PNG
-                    img_path = f"{st.session_state.temp_dir}/{idx:03d}.png"
-                    image.save(img_path, 'PNG')
+                    # Save full size PNG + proxy/thumbnail
+                    paths = save_renditions(image, st.session_state.temp_dir, idx, renditions)
                     
                     # Add to generated images list
                     st.session_state.generated_images.append({
                         'idx': idx,
                         'prompt': prompt,
-                        'path': img_path
+                        'path': str(paths['full']),
+                        'renditions': paths
                     })
                     
                     image_saved = True
@@ -274,7 +255,8 @@ if st.session_state.generating:
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
             for img_info in st.session_state.generated_images:
-                zip_file.write(img_info['path'], f"{img_info['idx']:03d}.png")
+                for path in img_info['renditions'].values():
+                    zip_file.write(path, Path(path).relative_to(st.session_state.temp_dir).as_posix())
         
         zip_buffer.seek(0)
         
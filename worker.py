@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Gemini 배치 이미지 생성기 - 워커 모드
+여러 프로세스/머신이 공유 디렉토리의 큐에서 프롬프트를 가져가 생성
+
+큐 디렉토리 구조:
+    pending/  대기 중인 작업 ({script}__{idx:03d}.json)
+    leased/   처리 중인 작업 ({script}__{idx:03d}@{worker_id}.json)
+    done/     완료된 작업
+    failed/   재시도 횟수를 초과한 작업
+
+작업 가져가기(claim)는 pending -> leased 로의 os.rename 으로 이루어지므로
+같은 파일시스템 안에서는 한 워커만 성공합니다. 처리 중에는 하트비트 스레드가
+leased 파일의 mtime 을 갱신하고, mtime 이 lease 시간보다 오래된 작업은
+다른 워커가 pending 으로 되돌립니다. 여러 머신에서 사용할 때는 시계가
+동기화(NTP)되어 있어야 합니다.
+
+결과는 {output}/{script}/{idx:03d}.png 로 저장되고, 프록시/썸네일은
+{output}/{script}/proxy/, {output}/{script}/thumb/ 에 저장됩니다.
+
+사용 예:
+    python worker.py enqueue --queue q --script ep01 ep01.txt
+    python worker.py run --queue q --output out --processes 4
+    python worker.py status --queue q
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import signal
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from PIL import Image as PILImage
+from renditions import RENDITIONS, decode_image, load_renditions, save_renditions
+
+QUEUE_STATES = ("pending", "leased", "done", "failed")
+
+class LeaseLost(Exception):
+    """다른 워커가 만료된 lease 를 회수해 간 경우"""
+
+
+class FileQueue:
+    def __init__(self, root, lease_seconds=300, max_attempts=3, create=True):
+        self.root = Path(root)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        if create:
+            for state in QUEUE_STATES:
+                (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def exists(self):
+        return all((self.root / state).is_dir() for state in QUEUE_STATES)
+
+    def enqueue(self, script, prompts, style="", resolution="1K"):
+        if not re.fullmatch(r"[\w.-]+", script):
+            raise ValueError(f"대본 이름에 사용할 수 없는 문자가 있습니다: {script}")
+
+        added = 0
+        for idx, prompt in enumerate(prompts, 1):
+            name = f"{script}__{idx:03d}"
+            if self._exists(name):
+                continue
+            job = {
+                "script": script,
+                "idx": idx,
+                "prompt": prompt,
+                "style": style,
+                "resolution": resolution,
+                "attempts": 0,
+                "errors": []
+            }
+            tmp_path = self.root / f".{name}.json.tmp-{os.getpid()}"
+            tmp_path.write_text(json.dumps(job, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.root / "pending" / f"{name}.json")
+            added += 1
+        return added
+
+    def _exists(self, name):
+        for state in ("pending", "done", "failed"):
+            if (self.root / state / f"{name}.json").exists():
+                return True
+        return any((self.root / "leased").glob(f"{name}@*.json"))
+
+    def retry_or_fail(self, lease_path, error):
+        """시도 횟수를 올리고 pending 또는 failed 로 옮김. 이미 없으면 FileNotFoundError"""
+        name = lease_path.name.split("@", 1)[0]
+
+        # 먼저 다른 워커가 볼 수 없는 이름으로 옮겨 이 작업을 독점한 뒤 수정
+        private_path = self.root / f".{name}.json.retry-{os.getpid()}-{threading.get_ident()}"
+        os.rename(lease_path, private_path)
+
+        job = json.loads(private_path.read_text(encoding="utf-8"))
+        job["attempts"] += 1
+        job["errors"].append(error)
+        private_path.write_text(json.dumps(job, ensure_ascii=False), encoding="utf-8")
+
+        state = "failed" if job["attempts"] >= self.max_attempts else "pending"
+        os.rename(private_path, self.root / state / f"{name}.json")
+        return state
+
+    def reap_expired(self):
+        """lease 가 만료된 작업을 시도 1회로 세어 pending(또는 failed)으로 되돌림"""
+        now = time.time()
+        reaped = 0
+        for path in (self.root / "leased").glob("*@*.json"):
+            try:
+                if now - path.stat().st_mtime < self.lease_seconds:
+                    continue
+                self.retry_or_fail(path, "lease 만료")
+                reaped += 1
+            except FileNotFoundError:
+                # 작업이 끝났거나 다른 워커가 먼저 회수함
+                continue
+        return reaped
+
+    def claim(self, worker_id):
+        """대기 중인 작업 하나를 가져감. 없으면 None"""
+        self.reap_expired()
+        for path in sorted((self.root / "pending").glob("*.json")):
+            lease_path = self.root / "leased" / f"{path.stem}@{worker_id}.json"
+            try:
+                # rename 은 mtime 을 유지하므로 먼저 갱신해야 오래 대기한 작업이
+                # leased 로 옮겨지자마자 만료로 회수되지 않음
+                os.utime(path)
+                os.rename(path, lease_path)
+            except FileNotFoundError:
+                continue
+            try:
+                os.utime(lease_path)
+                job = json.loads(lease_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                # 다른 워커가 그 사이에 회수함
+                continue
+            return Lease(self, lease_path, job)
+        return None
+
+    def counts(self):
+        return {
+            state: len(list((self.root / state).glob("*.json")))
+            for state in QUEUE_STATES
+        }
+
+    def is_drained(self):
+        counts = self.counts()
+        return counts["pending"] == 0 and counts["leased"] == 0
+
+
+class Lease:
+    def __init__(self, queue, path, job):
+        self.queue = queue
+        self.path = path
+        self.job = job
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start_heartbeat(self, interval):
+        def beat():
+            while not self._stop.wait(interval):
+                try:
+                    os.utime(self.path)
+                except FileNotFoundError:
+                    self.lost = True
+                    return
+
+        self._thread = threading.Thread(target=beat, daemon=True)
+        self._thread.start()
+
+    def stop_heartbeat(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _move(self, state, name):
+        try:
+            os.rename(self.path, self.queue.root / state / name)
+        except FileNotFoundError:
+            raise LeaseLost(self.path.name)
+
+    def release(self):
+        """중단 시 시도 횟수를 올리지 않고 pending 으로 반납"""
+        self.stop_heartbeat()
+        try:
+            os.rename(self.path, self.queue.root / "pending" / f"{self.path.name.split('@', 1)[0]}.json")
+        except FileNotFoundError:
+            # 이미 끝났거나 다른 워커가 회수함
+            pass
+
+    def complete(self):
+        self.stop_heartbeat()
+        self._move("done", f"{self.path.name.split('@', 1)[0]}.json")
+
+    def fail(self, error):
+        self.stop_heartbeat()
+        if self.lost:
+            raise LeaseLost(self.path.name)
+        try:
+            return self.queue.retry_or_fail(self.path, error)
+        except FileNotFoundError:
+            raise LeaseLost(self.path.name)
+
+
+class FakeClient:
+    """API 호출 없이 단색 이미지를 돌려주는 테스트용 클라이언트"""
+
+    def __init__(self, delay=0.0):
+        self.models = self
+        self.delay = delay
+
+    def generate_content(self, model, contents, config=None):
+        from io import BytesIO
+        from types import SimpleNamespace
+        import zlib
+
+        time.sleep(self.delay)
+
+        # 16:9 크롭 경로를 타도록 정사각형으로 생성
+        seed = zlib.crc32(contents.encode("utf-8"))
+        color = (seed & 0xFF, (seed >> 8) & 0xFF, (seed >> 16) & 0xFF)
+        buffer = BytesIO()
+        PILImage.new("RGB", (1024, 1024), color).save(buffer, "PNG")
+
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=buffer.getvalue()))
+        return SimpleNamespace(parts=[part])
+
+
+def make_client(api_key, fake=False, fake_delay=0.0):
+    if fake:
+        return FakeClient(delay=fake_delay), None
+
+    # Import here to avoid slow startup
+    from google import genai
+    from google.genai import types
+
+    return genai.Client(api_key=api_key), types
+
+
+def generate_job(client, types, job, output_dir, renditions, specs):
+    full_prompt = f"{job['prompt']}, {job['style']}" if job["style"] else job["prompt"]
+    full_prompt = f"{full_prompt}, 16:9 aspect ratio, widescreen"
+
+    kwargs = {}
+    if types is not None:
+        kwargs["config"] = types.GenerateContentConfig(
+            response_modalities=["TEXT", "IMAGE"],
+            image_config=types.ImageConfig(
+                image_size=job["resolution"]
+            )
+        )
+
+    response = client.models.generate_content(
+        model="gemini-3-pro-image-preview",
+        contents=full_prompt,
+        **kwargs
+    )
+
+    for part in response.parts:
+        if part.inline_data is not None:
+            # Decode, convert to RGB and crop to 16:9
+            image = decode_image(part.inline_data.data)
+
+            # Save full size PNG + proxy/thumbnail (교체 방식이라 중복 처리돼도 안전)
+            script_dir = Path(output_dir) / job["script"]
+            return save_renditions(image, script_dir, job["idx"], renditions, specs)
+
+    raise RuntimeError("응답에 이미지 없음")
+
+
+def run_worker(args, worker_id):
+    queue = FileQueue(args.queue, lease_seconds=args.lease, max_attempts=args.max_attempts)
+    client, types = make_client(args.api_key, fake=args.fake, fake_delay=args.fake_delay)
+
+    def log(message):
+        print(f"[{worker_id}] {message}", flush=True)
+
+    # terminate()/kill 로 종료될 때도 아래에서 lease 를 반납하도록 SystemExit 로 바꿈
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    log("🚀 워커 시작")
+    processed = 0
+
+    while True:
+        lease = queue.claim(worker_id)
+        if lease is None:
+            if not args.wait and queue.is_drained():
+                break
+            # 다른 워커가 처리 중인 작업의 lease 만료를 기다림
+            time.sleep(args.poll)
+            continue
+
+        job = lease.job
+        name = f"{job['script']}/{job['idx']:03d}.png"
+        log(f"🎨 {name} {job['prompt'][:40]}...")
+        lease.start_heartbeat(args.heartbeat)
+
+        try:
+            generate_job(client, types, job, args.output, args.renditions, args.rendition_specs)
+            lease.complete()
+            log(f"✅ 저장 완료: {name}")
+        except LeaseLost:
+            log(f"⚠️ lease 만료로 다른 워커에 넘어감: {name}")
+        except (KeyboardInterrupt, SystemExit):
+            lease.release()
+            log(f"⏹️ 중지: {name} 을(를) 대기열로 반납")
+            raise
+        except Exception as e:
+            try:
+                state = lease.fail(str(e))
+                log(f"❌ 실패 ({state}): {name} - {str(e)}")
+            except LeaseLost:
+                log(f"⚠️ lease 만료로 다른 워커에 넘어감: {name}")
+
+        processed += 1
+
+        # API 제한 대기
+        if args.interval > 0:
+            time.sleep(args.interval)
+
+    log(f"🎉 종료: {processed}개 처리")
+
+
+def _worker_process(args, worker_id):
+    try:
+        run_worker(args, worker_id)
+    except KeyboardInterrupt:
+        pass
+
+
+def cmd_enqueue(args):
+    text = Path(args.prompts).read_text(encoding="utf-8")
+    prompts = [p.strip() for p in text.split('\n') if p.strip()]
+    if not prompts:
+        print("❌ 유효한 프롬프트가 없습니다")
+        return 1
+
+    queue = FileQueue(args.queue)
+    added = queue.enqueue(args.script, prompts, style=args.style, resolution=args.resolution)
+    print(f"📝 {args.script}: {added}/{len(prompts)}개 작업 추가")
+    return 0
+
+
+def cmd_run(args):
+    if not args.fake and not args.api_key:
+        print("❌ API 키를 입력해주세요 (--api-key 또는 GEMINI_API_KEY)")
+        return 1
+
+    if args.heartbeat >= args.lease:
+        print("❌ 하트비트 간격(--heartbeat)은 lease 시간(--lease)보다 짧아야 합니다")
+        return 1
+
+    args.rendition_specs = RENDITIONS
+    if args.rendition_config:
+        try:
+            args.rendition_specs = load_renditions(args.rendition_config)
+        except (OSError, ValueError) as e:
+            print(f"❌ 출력 설정 오류: {str(e)}")
+            return 1
+
+    # 지정하지 않으면 설정된 출력을 모두 저장
+    args.renditions = [name.strip() for name in args.renditions.split(",") if name.strip()]
+    args.renditions = args.renditions or list(args.rendition_specs)
+    unknown = [name for name in args.renditions if name not in args.rendition_specs]
+    if unknown:
+        print(f"❌ 알 수 없는 출력: {', '.join(unknown)} (사용 가능: {', '.join(args.rendition_specs)})")
+        return 1
+
+    base_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    base_id = re.sub(r"[^\w.-]", "_", base_id)
+
+    if args.processes <= 1:
+        _worker_process(args, base_id)
+        return 0
+
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(args, f"{base_id}-{n}"))
+        for n in range(1, args.processes + 1)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # Ctrl+C 는 워커 프로세스에도 전달되므로 lease 를 반납할 때까지 기다림
+        for process in processes:
+            process.join()
+    return 0
+
+
+def cmd_status(args):
+    # 경로를 잘못 입력했을 때 빈 큐를 만들어 0개로 보이지 않도록 생성하지 않음
+    queue = FileQueue(args.queue, create=False)
+    if not queue.exists():
+        print(f"❌ 큐 디렉토리가 없습니다: {args.queue}")
+        return 1
+
+    counts = queue.counts()
+    print(" ".join(f"{state}={counts[state]}" for state in QUEUE_STATES))
+
+    for path in sorted((queue.root / "failed").glob("*.json")):
+        job = json.loads(path.read_text(encoding="utf-8"))
+        error = job["errors"][-1] if job["errors"] else ""
+        print(f"  {job['script']}/{job['idx']:03d}. {job['prompt'][:30]}... - {error}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gemini 배치 이미지 생성기 - 워커 모드")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = subparsers.add_parser("enqueue", help="프롬프트 파일을 큐에 추가")
+    enqueue.add_argument("prompts", help="프롬프트 파일 (한 줄에 하나씩)")
+    enqueue.add_argument("--queue", required=True, help="공유 큐 디렉토리")
+    enqueue.add_argument("--script", required=True, help="대본 이름 (출력 폴더 이름)")
+    enqueue.add_argument("--style", default="", help="모든 이미지에 적용할 스타일")
+    enqueue.add_argument("--resolution", default="1K", choices=["1K", "2K", "4K"],
+                         help="1K=1080p, 2K=1440p, 4K=2160p")
+    enqueue.set_defaults(func=cmd_enqueue)
+
+    run = subparsers.add_parser("run", help="큐에서 작업을 가져와 생성")
+    run.add_argument("--queue", required=True, help="공유 큐 디렉토리")
+    run.add_argument("--output", required=True, help="공유 출력 디렉토리")
+    run.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY", ""))
+    run.add_argument("--worker-id", default="", help="기본값: 호스트이름-PID")
+    run.add_argument("--processes", type=int, default=1, help="이 머신에서 띄울 워커 수")
+    run.add_argument("--interval", type=float, default=60, help="작업 사이 대기 시간(초)")
+    run.add_argument("--lease", type=float, default=300, help="lease 만료 시간(초)")
+    run.add_argument("--heartbeat", type=float, default=30, help="하트비트 간격(초)")
+    run.add_argument("--poll", type=float, default=5, help="빈 큐 확인 간격(초)")
+    run.add_argument("--max-attempts", type=int, default=3, help="작업당 최대 시도 횟수")
+    run.add_argument("--renditions", default="",
+                     help="저장할 출력 (쉼표 구분, 예: full,proxy). 기본값: 설정된 출력 전부")
+    run.add_argument("--rendition-config", default="",
+                     help="출력별 크기·형식·품질을 바꾸거나 추가하는 JSON 파일")
+    run.add_argument("--wait", action="store_true", help="큐가 비어도 종료하지 않음")
+    run.add_argument("--fake", action="store_true", help="API 대신 테스트용 클라이언트 사용")
+    run.add_argument("--fake-delay", type=float, default=0.0, help="테스트용 클라이언트 지연(초)")
+    run.set_defaults(func=cmd_run)
+
+    status = subparsers.add_parser("status", help="큐 상태 보기")
+    status.add_argument("--queue", required=True, help="공유 큐 디렉토리")
+    status.set_defaults(func=cmd_status)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())